@@ -5,8 +5,10 @@ Connect and disconnect virtual displays by managing EDIDs and sysfs connector st
 from __future__ import annotations
 
 import json
+import sys
 import time
 from pathlib import Path
+from typing import Any
 
 from src.drm import (
     find_empty_slot,
@@ -15,8 +17,8 @@ from src.drm import (
     get_connected_displays,
     get_drm_devices,
     release_crtc,
-    run_command,
     wait_for_output_ready,
+    write_sysfs,
 )
 from src.drm.de import hyprland
 from src.drm.de.kwin import clear_kwin_output_config
@@ -43,6 +45,51 @@ def _use_hyprland_safe_path(card_name: str) -> bool:
     return "nvidia" in _card_driver(card_name) and hyprland.available()
 
 
+def _emit(lines: list[str]) -> None:
+    """Write a block of status lines with one write instead of one print each."""
+    _ = sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _parse_legacy_state(text: str) -> dict[str, Any] | None:
+    """
+    Parse the pre-JSON line-based state file: card, port, comma-separated
+    previous displays, edid_override path, Hyprland restore JSON.
+    """
+    lines = text.strip().split("\n")
+    if len(lines) < 2:
+        return None
+    try:
+        hyprland_restore = json.loads(lines[4]) if len(lines) > 4 and lines[4] else {}
+    except ValueError:
+        hyprland_restore = {}
+    return {
+        "card": lines[0],
+        "port": lines[1],
+        "previous": lines[2].split(",") if len(lines) > 2 and lines[2] else [],
+        "edid_override": lines[3] if len(lines) > 3 else "",
+        "hyprland_restore": hyprland_restore,
+    }
+
+
+def _load_state(state_file: Path) -> dict[str, Any] | None:
+    """
+    Parse the session state; None if it is unreadable or malformed.
+    Files left by older versions (install.sh keeps the state file across
+    reinstalls) use the line-based layout and are read as well.
+    """
+    try:
+        text = state_file.read_text()
+    except (OSError, ValueError):
+        return None
+    try:
+        state = json.loads(text)
+    except ValueError:
+        state = _parse_legacy_state(text)
+    if not isinstance(state, dict) or not state.get("card") or not state.get("port"):
+        return None
+    return state
+
+
 def connect(width: int, height: int, refresh_rate: int, device: str | None = None) -> bool:
     """
     Connect a virtual display:
@@ -60,51 +107,54 @@ def connect(width: int, height: int, refresh_rate: int, device: str | None = Non
     # doesn't appear in connected_displays and end up in previous_displays.
     state_file = SCRIPT_DIR / "virt_display.state"
     if state_file.exists():
-        stale = state_file.read_text().strip().split("\n")
-        stale_card = stale[0] if len(stale) > 0 else ""
-        stale_port = stale[1] if len(stale) > 1 else ""
-        stale_edid = stale[3] if len(stale) > 3 else ""
-        if stale_card and stale_port:
+        stale = _load_state(state_file)
+        if stale:
+            stale_card, stale_port = stale["card"], stale["port"]
+            stale_edid = stale.get("edid_override")
             print(f"  Stale session detected ({stale_card}-{stale_port}) — cleaning up...")
             if stale_edid:
-                _ = run_command(f"sh -c 'cat /dev/null > {stale_edid}'")
-            _ = run_command(f"sh -c 'echo off > /sys/class/drm/{stale_card}-{stale_port}/status'")
+                _ = write_sysfs(stale_edid, b"")
+            _ = write_sysfs(f"/sys/class/drm/{stale_card}-{stale_port}/status", b"off\n")
             time.sleep(0.5)  # let DRM process the hotplug before scanning
         state_file.unlink()
 
     # Step 1: Generate custom EDID
-    print("Step 1: Generating custom EDID...")
-    print(f"  Requested: {width}x{height} @ {refresh_rate}Hz")
-
     pixel_clock_mhz, max_mhz, will_break = get_pixel_clock_info(
         width, height, refresh_rate
     )
-    print(f"  Pixel clock: {pixel_clock_mhz:.2f} MHz (max: {max_mhz:.2f} MHz)")
+    lines = [
+        "Step 1: Generating custom EDID...",
+        f"  Requested: {width}x{height} @ {refresh_rate}Hz",
+        f"  Pixel clock: {pixel_clock_mhz:.2f} MHz (max: {max_mhz:.2f} MHz)",
+    ]
 
     if will_break:
-        print(
+        lines.append(
             f"  ⚠️  WARNING: Pixel clock exceeds limit by {pixel_clock_mhz - max_mhz:.2f} MHz!"
         )
-        print(f"  Finding best VIC standard resolution...")
+        lines.append(f"  Finding best VIC standard resolution...")
+        # Write before the lookup, which prints its own match report
+        _emit(lines)
+        lines = []
 
         vic_result = find_best_vic_resolution(width, height, refresh_rate)
         if vic_result:
-            vic_width, vic_height, vic_refresh, vic_code, vic_name = vic_result
-            print(
+            vic_width, vic_height, vic_refresh, vic_code, vic_name, new_clock_mhz = vic_result
+            lines.append(
                 f"  → Falling back to VIC {vic_code}: {vic_width}x{vic_height} @ {vic_refresh}Hz ({vic_name})"
             )
-
-            new_clock_mhz, _, _ = get_pixel_clock_info(
-                vic_width, vic_height, vic_refresh
-            )
-            print(f"  → New pixel clock: {new_clock_mhz:.2f} MHz")
+            lines.append(f"  → New pixel clock: {new_clock_mhz:.2f} MHz")
 
             width, height, refresh_rate = vic_width, vic_height, vic_refresh
         else:
-            print(f"  ⚠️  No suitable VIC found, attempting custom resolution anyway...")
+            lines.append(f"  ⚠️  No suitable VIC found, attempting custom resolution anyway...")
     else:
-        print(f"  ✓ Pixel clock within limits")
-        print(f"  ✓ Using custom resolution: {width}x{height} @ {refresh_rate}Hz")
+        lines.append(f"  ✓ Pixel clock within limits")
+        lines.append(f"  ✓ Using custom resolution: {width}x{height} @ {refresh_rate}Hz")
+
+    # Everything decided so far goes out before generation, so the diagnostics
+    # are visible even if create_edid raises
+    _emit(lines)
 
     edid_data = create_edid(
         width=width,
@@ -114,11 +164,12 @@ def connect(width: int, height: int, refresh_rate: int, device: str | None = Non
         display_name="Virtual Display",
     )
 
-    edid_file = SCRIPT_DIR / "custom_edid.bin"
-    _ = edid_file.write_bytes(edid_data)
-    print(f"  ✓ Created EDID file: {edid_file}")
-    print(f"  ✓ Final resolution: {width}x{height} @ {refresh_rate}Hz")
-    print(f"  ✓ EDID size: {len(edid_data)} bytes")
+    _emit(
+        [
+            f"  ✓ Final resolution: {width}x{height} @ {refresh_rate}Hz",
+            f"  ✓ EDID size: {len(edid_data)} bytes",
+        ]
+    )
 
     # Step 2: Find DRM devices and list connected displays
     print("\nStep 2: Scanning displays...")
@@ -128,6 +179,7 @@ def connect(width: int, height: int, refresh_rate: int, device: str | None = Non
         print("Error: No DRM devices found")
         return False
 
+    scanned: dict[str, list[str]] = {}
     if device:
         # User explicitly specified a card — find it or fail clearly.
         matched = [d for d in drm_devices if get_card_name_from_device(d) == device]
@@ -144,22 +196,28 @@ def connect(width: int, height: int, refresh_rate: int, device: str | None = Non
         best_count = -1
         for dev in drm_devices:
             c = get_card_name_from_device(dev)
-            n = len(get_connected_displays(c))
+            # Keep each card's scan so the chosen one isn't read from sysfs again
+            scanned[c] = get_connected_displays(c)
+            n = len(scanned[c])
             if n > best_count:
                 best_count = n
                 best_device = dev
         drm_device = best_device
     card_name = get_card_name_from_device(drm_device)
-    print(f"  Using device: {drm_device.name} ({card_name})")
 
-    connected_displays = get_connected_displays(card_name)
-    print(
-        f"  Connected displays: {connected_displays if connected_displays else 'None'}"
+    connected_displays = scanned.get(card_name)
+    if connected_displays is None:
+        connected_displays = get_connected_displays(card_name)
+    _emit(
+        [
+            f"  Using device: {drm_device.name} ({card_name})",
+            f"  Connected displays: {connected_displays if connected_displays else 'None'}",
+        ]
     )
 
     # Step 3: Find empty slot
     print("\nStep 3: Finding empty display slot...")
-    empty_port, slot_device = find_empty_slot(drm_device, card_name)
+    empty_port, slot_device = find_empty_slot(drm_device, card_name, connected_displays)
 
     if not empty_port:
         print("Error: No empty display slots available")
@@ -167,19 +225,34 @@ def connect(width: int, height: int, refresh_rate: int, device: str | None = Non
 
     print(f"  ✓ Selected slot: {empty_port}")
 
+    # Every sysfs attribute the remaining steps toggle, resolved once
+    status_paths = {
+        port: f"/sys/class/drm/{card_name}-{port}/status"
+        for port in (*connected_displays, empty_port)
+    }
+    edid_override_path = slot_device / empty_port / "edid_override"
+
     # Step 4: Override EDID
     print(f"\nStep 4: Overriding EDID for {empty_port}...")
-    edid_override_path = slot_device / empty_port / "edid_override"
 
-    cmd = f"sh -c 'cat {edid_file.absolute()} > {edid_override_path}'"
-    result = run_command(cmd)
+    error = write_sysfs(edid_override_path, edid_data)
 
-    if result.returncode != 0:
-        print(f"  Error overriding EDID: {result.stderr}")
+    if error:
+        print(f"  Error overriding EDID: {error}")
         return False
 
     print(f"  ✓ EDID override applied")
 
+    # The override is written from memory; keep a copy on disk for debugging
+    # only once it has actually been applied. The override is already live, so
+    # a failure here must not abort the connect.
+    edid_file = SCRIPT_DIR / "custom_edid.bin"
+    error = write_sysfs(edid_file, edid_data)
+    if error:
+        print(f"  Warning: Could not save EDID copy: {error}")
+    else:
+        print(f"  ✓ Saved EDID copy: {edid_file}")
+
     hyprland_safe = _use_hyprland_safe_path(card_name)
     hyprland_restore_specs: dict[str, dict[str, object]] = {}
 
@@ -201,21 +274,18 @@ def connect(width: int, height: int, refresh_rate: int, device: str | None = Non
         print("\nStep 5: Turning off connected displays...")
         for display in connected_displays:
             _ = release_crtc(card_name, display)
-            status_path = f"/sys/class/drm/{card_name}-{display}/status"
-            cmd = f"sh -c 'echo off > {status_path}'"
-            _ = run_command(cmd)
+            _ = write_sysfs(status_paths[display], b"off\n")
             print(f"  ✓ Turned off {display}")
 
     # Step 6: Clear any stale KWin output config, then turn on virtual display
     print(f"\nStep 6: Preparing virtual display ({empty_port})...")
     clear_kwin_output_config(empty_port)
     print(f"  Turning on virtual display ({empty_port})...")
-    status_path = f"/sys/class/drm/{card_name}-{empty_port}/status"
-    cmd = f"sh -c 'echo on > {status_path}'"
-    result = run_command(cmd)
+    status_path = status_paths[empty_port]
+    error = write_sysfs(status_path, b"on\n")
 
-    if result.returncode != 0:
-        print(f"  Error turning on display: {result.stderr}")
+    if error:
+        print(f"  Error turning on display: {error}")
         return False
 
     print(f"  ✓ Virtual display enabled on {empty_port}")
@@ -230,8 +300,8 @@ def connect(width: int, height: int, refresh_rate: int, device: str | None = Non
         print(f"  ✓ Output ready ({mode})")
     elif hyprland_safe:
         print("  ✗ Timed out waiting for virtual output; refusing to hide physical outputs")
-        _ = run_command(f"sh -c 'echo off > /sys/class/drm/{card_name}-{empty_port}/status'")
-        _ = run_command(f"sh -c 'cat /dev/null > {edid_override_path}'")
+        _ = write_sysfs(status_path, b"off\n")
+        _ = write_sysfs(edid_override_path, b"")
         return False
     else:
         print(f"  ⚠ Compositor did not assign CRTC — forcing assignment...")
@@ -248,21 +318,32 @@ def connect(width: int, height: int, refresh_rate: int, device: str | None = Non
             print(f"  ✓ Hidden: {', '.join(connected_displays)}")
         else:
             print("  ✗ Could not hide one or more physical outputs — cleaning up virtual display")
-            _ = run_command(f"sh -c 'echo off > /sys/class/drm/{card_name}-{empty_port}/status'")
-            _ = run_command(f"sh -c 'cat /dev/null > {edid_override_path}'")
+            _ = write_sysfs(status_path, b"off\n")
+            _ = write_sysfs(edid_override_path, b"")
             return False
 
-    # Save state for disconnect (line 4 = edid_override_path for cleanup,
-    # line 5 = Hyprland restore JSON when compositor-safe path was used)
+    # Save state for disconnect; hyprland_restore is only non-empty when the
+    # compositor-safe path was used
     state_file = SCRIPT_DIR / "virt_display.state"
     _ = state_file.write_text(
-        f"{card_name}\n{empty_port}\n{','.join(connected_displays)}\n{edid_override_path}\n"
-        f"{json.dumps(hyprland_restore_specs)}"
+        json.dumps(
+            {
+                "card": card_name,
+                "port": empty_port,
+                "previous": connected_displays,
+                "edid_override": str(edid_override_path),
+                "hyprland_restore": hyprland_restore_specs,
+            }
+        )
     )
 
-    print(f"\n✓ Virtual display successfully connected!")
-    print(f"  Port: {card_name}-{empty_port}")
-    print(f"  Resolution: {width}x{height}@{refresh_rate}Hz")
+    _emit(
+        [
+            f"\n✓ Virtual display successfully connected!",
+            f"  Port: {card_name}-{empty_port}",
+            f"  Resolution: {width}x{height}@{refresh_rate}Hz",
+        ]
+    )
 
     return True
 
@@ -280,22 +361,23 @@ def disconnect() -> bool:
         print("Error: No state file found. Was a virtual display connected?")
         return False
 
-    state_data = state_file.read_text().strip().split("\n")
-    if len(state_data) < 2:
+    state = _load_state(state_file)
+    if state is None:
         print("Error: Invalid state file")
         return False
 
-    card_name = state_data[0]
-    virtual_port = state_data[1]
-    previous_displays = state_data[2].split(",") if len(state_data) > 2 and state_data[2] else []
-    try:
-        hyprland_restore_specs = json.loads(state_data[4]) if len(state_data) > 4 and state_data[4] else {}
-    except json.JSONDecodeError:
-        hyprland_restore_specs = {}
+    card_name = state["card"]
+    virtual_port = state["port"]
+    previous_displays: list[str] = state.get("previous") or []
+    hyprland_restore_specs: dict[str, dict[str, object]] = state.get("hyprland_restore") or {}
     hyprland_safe = bool(hyprland_restore_specs)
 
-    print(f"  Virtual display: {card_name}-{virtual_port}")
-    print(f"  Previous displays: {previous_displays if previous_displays else 'None'}")
+    _emit(
+        [
+            f"  Virtual display: {card_name}-{virtual_port}",
+            f"  Previous displays: {previous_displays if previous_displays else 'None'}",
+        ]
+    )
 
     if hyprland_safe:
         print("\nStep 1: Restoring physical outputs via Hyprland...")
@@ -311,8 +393,7 @@ def disconnect() -> bool:
         print("\nStep 1: Turning on previous displays...")
         for disp in previous_displays:
             if disp:
-                status_path = f"/sys/class/drm/{card_name}-{disp}/status"
-                _ = run_command(f"sh -c 'echo on > {status_path}'")
+                _ = write_sysfs(f"/sys/class/drm/{card_name}-{disp}/status", b"on\n")
                 print(f"  ✓ Turned on {disp}")
 
         # Force CRTC assignment and verify each display is actually up.
@@ -355,10 +436,10 @@ def disconnect() -> bool:
 
     print(f"\nStep 4: Turning off virtual display ({virtual_port})...")
     status_path = f"/sys/class/drm/{card_name}-{virtual_port}/status"
-    result = run_command(f"sh -c 'echo off > {status_path}'")
+    error = write_sysfs(status_path, b"off\n")
 
-    if result.returncode != 0:
-        print(f"  Warning: Could not turn off virtual display: {result.stderr}")
+    if error:
+        print(f"  Warning: Could not turn off virtual display: {error}")
     else:
         print(f"  ✓ Virtual display turned off")
 
@@ -366,9 +447,9 @@ def disconnect() -> bool:
     # Without this, a future connect() sees the port as connected and stores it in
     # previous_displays, causing disconnect to try to restore a virtual port as if
     # it were a physical display.
-    edid_override_path = state_data[3] if len(state_data) > 3 else ""
+    edid_override_path = state.get("edid_override", "")
     if edid_override_path:
-        _ = run_command(f"sh -c 'cat /dev/null > {edid_override_path}'")
+        _ = write_sysfs(edid_override_path, b"")
         print(f"  ✓ EDID override cleared")
 
     state_file.unlink()
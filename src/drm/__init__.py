@@ -9,7 +9,9 @@ from src.drm.sysfs import (
     get_connected_displays,
     get_display_ports,
     get_drm_devices,
+    get_port_status,
     run_command,
+    write_sysfs,
 )
 
 __all__ = [
@@ -19,7 +21,9 @@ __all__ = [
     "get_connected_displays",
     "get_display_ports",
     "get_drm_devices",
+    "get_port_status",
     "release_crtc",
     "run_command",
     "wait_for_output_ready",
+    "write_sysfs",
 ]
@@ -9,27 +9,47 @@ import os
 import subprocess
 from pathlib import Path
 
+DEBUG_DRI_PATH = "/sys/kernel/debug/dri"
+DRM_CLASS_PATH = "/sys/class/drm"
 
-def run_command(command: str) -> subprocess.CompletedProcess[str]:
-    """Run a shell command and return the CompletedProcess."""
-    return subprocess.run(command, shell=True, capture_output=True, text=True)
+# PCI device name -> card name; card numbering is stable while the daemon runs
+_card_cache: dict[str, str] = {}
+
+
+def run_command(args: str | list[str]) -> subprocess.CompletedProcess[str]:
+    """
+    Run a command and return the CompletedProcess. An argv list is executed
+    directly; a string is run through the shell, as it always has been.
+    """
+    return subprocess.run(args, shell=isinstance(args, str), capture_output=True, text=True)
+
+
+def write_sysfs(path: str | Path, data: bytes) -> str | None:
+    """
+    Write raw bytes to a sysfs/debugfs attribute (or a small regular file)
+    with a single unbuffered write. Returns None on success, or the error
+    message on failure.
+    An empty payload only truncates, like `cat /dev/null > path`.
+    """
+    try:
+        with open(path, "wb", buffering=0) as f:
+            if data:
+                _ = f.write(data)
+    except OSError as e:
+        return str(e)
+    return None
 
 
 def get_drm_devices() -> list[Path]:
     """Get list of DRM devices from /sys/kernel/debug/dri/"""
-    debug_dri_path = "/sys/kernel/debug/dri"
-    devices: list[Path] = []
-
-    result = run_command(f"ls -1 {debug_dri_path}")
-    if result.returncode != 0:
+    try:
+        with os.scandir(DEBUG_DRI_PATH) as entries:
+            devices = [Path(entry.path) for entry in entries if entry.name.startswith("0000:")]
+    except OSError:
         print(
             "Error: /sys/kernel/debug/dri not found or not accessible. Make sure debugfs is mounted."
         )
-        return devices
-
-    for line in result.stdout.strip().split("\n"):
-        if line.startswith("0000:"):
-            devices.append(Path(debug_dri_path) / line)
+        return []
 
     return sorted(devices)
 
@@ -38,44 +58,76 @@ def get_display_ports(drm_device: Path) -> dict[str, list[str]]:
     """Get all display ports for a given DRM device."""
     ports: dict[str, list[str]] = {"DP": [], "HDMI": []}
 
-    result = run_command(f"ls -1 {drm_device}")
-    if result.returncode != 0:
-        return ports
-
-    for line in result.stdout.strip().split("\n"):
-        port_name = line.strip()
-        if port_name.startswith("DP-"):
-            ports["DP"].append(port_name)
-        elif port_name.startswith("HDMI-"):
-            ports["HDMI"].append(port_name)
+    try:
+        with os.scandir(drm_device) as entries:
+            for entry in entries:
+                # "DP-1" -> "DP", "HDMI-A-1" -> "HDMI"; one dict lookup per entry
+                kind, sep, _ = entry.name.partition("-")
+                bucket = ports.get(kind) if sep else None
+                if bucket is not None:
+                    bucket.append(entry.name)
+    except OSError:
+        pass
 
     return ports
 
 
-def get_connected_displays(card_name: str) -> list[str]:
-    """Get list of currently connected displays from /sys/class/drm/"""
-    drm_path = Path("/sys/class/drm")
-    connected: list[str] = []
-
-    for display in drm_path.iterdir():
-        if display.name.startswith(f"{card_name}-"):
-            status_file = display / "status"
-            if status_file.exists():
-                try:
-                    status = status_file.read_text().strip()
-                    if status == "connected":
-                        port_name = display.name.replace(f"{card_name}-", "")
-                        connected.append(port_name)
-                except Exception:
-                    pass
+def _read_status(path: str) -> bytes | None:
+    """Read a connector status attribute with one raw read; None if unreadable."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, 16)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def get_port_status(card_name: str) -> dict[str, str]:
+    """
+    Map each of a card's connectors in /sys/class/drm/ to its status
+    ("connected", "disconnected", ...) in a single directory pass.
+    Connectors without a readable status file are left out.
+    """
+    prefix = f"{card_name}-"
+    statuses: dict[str, str] = {}
+
+    try:
+        with os.scandir(DRM_CLASS_PATH) as entries:
+            for entry in entries:
+                if not entry.name.startswith(prefix):
+                    continue
+                status = _read_status(entry.path + "/status")
+                if status is not None:
+                    statuses[entry.name[len(prefix):]] = status.strip().decode("ascii", "replace")
+    except OSError:
+        pass
+
+    return statuses
 
-    return connected
 
-
-def find_empty_slot(drm_device: Path, card_name: str) -> tuple[str | None, Path | None]:
-    """Find the first empty display slot, preferring DP over HDMI."""
+def get_connected_displays(card_name: str) -> list[str]:
+    """Get list of currently connected displays from /sys/class/drm/"""
+    return [
+        port for port, status in get_port_status(card_name).items() if status == "connected"
+    ]
+
+
+def find_empty_slot(
+    drm_device: Path,
+    card_name: str,
+    connected: list[str] | None = None,
+) -> tuple[str | None, Path | None]:
+    """
+    Find the first empty display slot, preferring DP over HDMI.
+    Pass `connected` when the caller already scanned the card to skip a rescan.
+    """
     ports = get_display_ports(drm_device)
-    connected = get_connected_displays(card_name)
+    if connected is None:
+        connected = get_connected_displays(card_name)
 
     for port in sorted(ports["DP"]):
         if port not in connected:
@@ -92,17 +144,31 @@ def get_card_name_from_device(drm_device_path: Path) -> str:
     """Extract card name (e.g., 'card1') from DRM device path."""
     device_name = drm_device_path.name
 
-    drm_class_path = Path("/sys/class/drm")
-    for card_dir in drm_class_path.iterdir():
-        if card_dir.name.startswith("card") and "-" not in card_dir.name:
-            device_link = card_dir / "device"
-            if device_link.exists():
+    cached = _card_cache.get(device_name)
+    if cached is not None:
+        # One readlink confirms the card wasn't renumbered (e.g. GPU rebind)
+        try:
+            if device_name in os.readlink(f"{DRM_CLASS_PATH}/{cached}/device"):
+                return cached
+        except OSError:
+            pass
+        del _card_cache[device_name]
+
+    try:
+        with os.scandir(DRM_CLASS_PATH) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.startswith("card") or "-" in name:
+                    continue
                 try:
-                    target = os.readlink(device_link)
-                    if device_name in target:
-                        return card_dir.name
-                except Exception:
-                    pass
+                    target = os.readlink(entry.path + "/device")
+                except OSError:
+                    continue
+                if device_name in target:
+                    _card_cache[device_name] = name
+                    return name
+    except OSError:
+        pass
 
     # Fallback: assume card1 for discrete GPU (most common case)
     return "card1"
@@ -4,11 +4,139 @@ EDID binary generator — builds a 256-byte EDID (base block + CEA-861 extension
 
 from __future__ import annotations
 
+import functools
 import struct
 
-from src.edid.timing import calculate_checksum
+from src.edid.timing import calculate_blanking, calculate_checksum
+
+_EDID_HEADER = b"\x00\xFF\xFF\xFF\xFF\xFF\xFF\x00"
+_MANUFACTURER_ID = b"\x56\x24"
+_COLOR_CHARACTERISTICS = b"\xEE\x91\xA3\x54\x4C\x99\x26\x0F\x50\x54"
+_STANDARD_TIMINGS = b"\x01\x01" * 8
+_NAME_TAG = b"\x00\x00\x00\xFC\x00"
+_DUMMY_DESCRIPTOR = b"\x00\x00\x00\x10\x00" + bytes(13)
+
+# Display range limits descriptor around the min/max V rate bytes:
+# H rate 30-160 kHz, max pixel clock 2200 MHz, default GTF, LF + padding
+_RANGE_LIMITS_TAG = b"\x00\x00\x00\xFD\x00"
+_RANGE_LIMITS_TAIL = bytes((30, 160, 220, 0x00, 0x0A)) + b"\x20" * 6
+
+# CEA-861 data blocks
+_HDR_DATA_BLOCKS = bytes((
+    # Colorimetry Data Block: BT2020RGB, BT2020YCC, BT2020cYCC
+    0xE3, 0x05, 0xE0, 0x00,
+    # HDR Static Metadata Data Block: SDR + HDR + PQ, descriptor type 1,
+    # max luminance 1000 cd/m², max frame-avg 400 cd/m², min 0.05 cd/m²
+    0xE6, 0x06, 0x07, 0x01, 0x78, 0x5A, 0x32,
+))
+# Video Capability Data Block
+_VIDEO_CAPABILITY_DB = b"\xE2\x00\x00"
+# HDMI Forum Vendor Specific Data Block: IEEE OUI for HDMI Forum, version 1,
+# max TMDS 600 MHz
+_HDMI_FORUM_VSDB = b"\x67\xD8\x5D\xC4\x01\x78\x00\x00"
+
+# Mode-dependent base block fields, keyed by enable_hdr:
+# (product code, video input definition, feature support)
+_MODE_FIELDS = {
+    # "HD" — digital 10-bit DisplayPort; RGB+YCbCr444, preferred timing, continuous
+    True: (0x4844, 0xB5, 0x1A),
+    # "SD" — digital 8-bit DisplayPort; RGB 4:4:4, sRGB, preferred timing, continuous
+    False: (0x5344, 0xA5, 0x1E),
+}
+
+# Bytes 0-24: header, manufacturer ID, product code, serial, week, year,
+# version, revision, video input, screen size (cm), gamma, feature support
+_BASE_HEADER = struct.Struct("<8s2sHIBBBBBBBBB")
+
+# Bytes 12-15: serial number
+_SERIAL = struct.Struct("<I")
+
+# Bytes 54-71: detailed timing descriptor (pixel clock + 16 packed fields)
+_DTD = struct.Struct("<H16B")
+
+# Hand the finished buffer back as immutable bytes. bytearray.take_bytes()
+# (Python 3.15+) steals the buffer instead of copying it.
+_freeze = getattr(bytearray, "take_bytes", bytes)
+
+
+def _build_template(enable_hdr: bool) -> bytes:
+    """
+    Build the 256-byte EDID skeleton holding every byte that does not depend
+    on resolution, refresh rate or display name. Variable fields are zero.
+    """
+    product_code, video_input, feature_support = _MODE_FIELDS[enable_hdr]
+    edid = bytearray(256)
+
+    # Header, manufacturer ID ("VHD" for Virtual HDR Display), product code,
+    # serial (per call), week 1 of 2023, EDID 1.4, video input,
+    # screen size (per call), gamma 2.2 and feature support
+    _BASE_HEADER.pack_into(
+        edid, 0,
+        _EDID_HEADER,
+        _MANUFACTURER_ID,
+        product_code,
+        0,
+        1, 33,
+        1, 4,
+        video_input,
+        0, 0,
+        220,
+        feature_support,
+    )
+
+    # Color characteristics (10 bytes), same primaries for SDR and HDR
+    edid[25:35] = _COLOR_CHARACTERISTICS
 
+    # Established timings (bytes 35-37) stay zero
 
+    # Standard timings — all unused
+    edid[38:54] = _STANDARD_TIMINGS
+
+    # Display product name descriptor tag (name written per call)
+    edid[72:77] = _NAME_TAG
+
+    # Display range limits (min/max V rate written per call)
+    edid[90:95] = _RANGE_LIMITS_TAG
+    edid[97:108] = _RANGE_LIMITS_TAIL
+
+    # Dummy descriptor
+    edid[108:126] = _DUMMY_DESCRIPTOR
+
+    # Extension flag
+    edid[126] = 1  # 1 extension block
+
+    # ===== CEA-861 EXTENSION BLOCK (128 bytes) =====
+
+    cea_start = 128
+
+    edid[cea_start] = 0x02      # CEA-861 tag
+    edid[cea_start + 1] = 0x03  # Revision 3
+    edid[cea_start + 3] = 0x70  # Underscan, Basic Audio, YCbCr 4:4:4
+
+    offset = cea_start + 4
+
+    if enable_hdr:
+        edid[offset:offset + len(_HDR_DATA_BLOCKS)] = _HDR_DATA_BLOCKS
+        offset += len(_HDR_DATA_BLOCKS)
+
+    edid[offset:offset + len(_VIDEO_CAPABILITY_DB)] = _VIDEO_CAPABILITY_DB
+    offset += len(_VIDEO_CAPABILITY_DB)
+
+    edid[offset:offset + len(_HDMI_FORUM_VSDB)] = _HDMI_FORUM_VSDB
+    offset += len(_HDMI_FORUM_VSDB)
+
+    # DTD offset (the DTD itself is copied in per call)
+    edid[cea_start + 2] = offset - cea_start
+
+    return bytes(edid)
+
+
+_TEMPLATES = {hdr: _build_template(hdr) for hdr in (True, False)}
+
+
+# create_edid is a pure function of hashable arguments returning immutable
+# bytes, so repeated connects with the same mode reuse the cached EDID.
+@functools.lru_cache(maxsize=128)
 def create_edid(
     width: int = 1920,
     height: int = 1080,
@@ -27,206 +155,81 @@ def create_edid(
         display_name: Display product name (max 13 chars)
     """
 
-    # EDID structure (128 bytes base block + 128 bytes CEA extension)
-    edid = bytearray(256)
+    # EDID structure (128 bytes base block + 128 bytes CEA extension),
+    # starting from the prebuilt skeleton for this mode
+    edid = bytearray(_TEMPLATES[bool(enable_hdr)])
 
     # ===== BASE EDID BLOCK (128 bytes) =====
 
-    # Header (8 bytes)
-    edid[0:8] = [0x00, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0x00]
-
-    # Manufacturer ID — "VHD" for Virtual HDR Display
-    edid[8] = 0x56
-    edid[9] = 0x24
-
-    # Product code
-    edid[10:12] = struct.pack("<H", 0x4844 if enable_hdr else 0x5344)
-
     # Serial number (unique per resolution/refresh)
     serial = (width << 16) | (height << 4) | (refresh_rate & 0x0F)
-    edid[12:16] = struct.pack("<I", serial)
-
-    # Week of manufacture, year
-    edid[16] = 1   # Week 1
-    edid[17] = 33  # 2023
+    _SERIAL.pack_into(edid, 12, serial)
 
-    # EDID version
-    edid[18] = 1  # Version 1
-    edid[19] = 4  # Revision 4
-
-    # Video input definition (digital)
-    if enable_hdr:
-        edid[20] = 0xB5  # Digital, 10-bit, DisplayPort
-    else:
-        edid[20] = 0xA5  # Digital, 8-bit, DisplayPort
-
-    # Screen size (cm)
-    diagonal_inches = ((width**2 + height**2) ** 0.5) / 96
-    aspect_ratio = width / height
-    h_size_cm = int((diagonal_inches * 2.54) / (1 + (1 / aspect_ratio) ** 2) ** 0.5)
-    v_size_cm = int(h_size_cm / aspect_ratio)
+    # Screen size (cm) at 96 DPI; the height follows the truncated width so the
+    # physical aspect ratio matches the mode
+    h_size_cm = int(width * 2.54 / 96)
+    v_size_cm = h_size_cm * height // width
     edid[21] = min(h_size_cm, 255)
     edid[22] = min(v_size_cm, 255)
 
-    # Display gamma (2.2)
-    edid[23] = 220
-
-    # Feature support
-    if enable_hdr:
-        edid[24] = 0x1A  # RGB+YCbCr444, preferred timing, continuous
-    else:
-        edid[24] = 0x1E  # RGB 4:4:4, sRGB, preferred timing, continuous
-
-    # Color characteristics (10 bytes)
-    if enable_hdr:
-        edid[25:35] = [0xEE, 0x91, 0xA3, 0x54, 0x4C, 0x99, 0x26, 0x0F, 0x50, 0x54]
-    else:
-        edid[25:35] = [0xEE, 0x91, 0xA3, 0x54, 0x4C, 0x99, 0x26, 0x0F, 0x50, 0x54]
-
-    # Established timings
-    edid[35:38] = [0x00, 0x00, 0x00]
-
-    # Standard timings — all unused
-    edid[38:54] = [0x01, 0x01] * 8
-
     # Detailed timing descriptor 1 (18 bytes) — custom resolution
     h_active = width
     v_active = height
-    h_blank = max(80, int(width * 0.08))
-    h_total = h_active + h_blank
-
-    v_blank_estimate = max(23, int(height * 0.025))
-    pixel_clock_hz = h_total * (v_active + v_blank_estimate) * refresh_rate
+    h_blank, _, v_blank, pixel_clock_hz = calculate_blanking(width, height, refresh_rate)
 
-    v_blank = int((pixel_clock_hz / (h_total * refresh_rate)) - v_active)
-    v_blank = max(23, v_blank)
-
-    pixel_clock_hz = h_total * (v_active + v_blank) * refresh_rate
-    pixel_clock = min(int(pixel_clock_hz / 10000), 65535)
-    edid[54:56] = struct.pack("<H", pixel_clock)
-
-    edid[56] = h_active & 0xFF
-    edid[57] = h_blank & 0xFF
-    edid[58] = ((h_active >> 8) << 4) | (h_blank >> 8)
-
-    edid[59] = v_active & 0xFF
-    edid[60] = v_blank & 0xFF
-    edid[61] = ((v_active >> 8) << 4) | (v_blank >> 8)
+    # Pixel clock in 10 kHz units, clamped to the 16-bit DTD field
+    pixel_clock = min(pixel_clock_hz // 10000, 65535)
 
     h_sync_offset = int(h_blank * 0.2)
     h_sync_width = int(h_blank * 0.4)
     v_sync_offset = 2
     v_sync_width = 6
 
-    edid[62] = h_sync_offset & 0xFF
-    edid[63] = h_sync_width & 0xFF
-    edid[64] = ((v_sync_offset & 0x0F) << 4) | (v_sync_width & 0x0F)
-    edid[65] = (
-        (((h_sync_offset >> 8) & 0x03) << 6)
-        | (((h_sync_width >> 8) & 0x03) << 4)
-        | (((v_sync_offset >> 4) & 0x03) << 2)
-        | ((v_sync_width >> 4) & 0x03)
-    )
-
     # Image size (mm)
     h_size_mm = h_size_cm * 10
     v_size_mm = v_size_cm * 10
-    edid[66] = h_size_mm & 0xFF
-    edid[67] = v_size_mm & 0xFF
-    edid[68] = ((h_size_mm >> 8) << 4) | (v_size_mm >> 8)
 
-    edid[69] = 0     # H border
-    edid[70] = 0     # V border
-    edid[71] = 0x18  # Non-interlaced, digital separate sync
+    _DTD.pack_into(
+        edid, 54,
+        pixel_clock,
+        h_active & 0xFF,
+        h_blank & 0xFF,
+        ((h_active >> 8) << 4) | (h_blank >> 8),
+        v_active & 0xFF,
+        v_blank & 0xFF,
+        ((v_active >> 8) << 4) | (v_blank >> 8),
+        h_sync_offset & 0xFF,
+        h_sync_width & 0xFF,
+        ((v_sync_offset & 0x0F) << 4) | (v_sync_width & 0x0F),
+        (((h_sync_offset >> 8) & 0x03) << 6)
+        | (((h_sync_width >> 8) & 0x03) << 4)
+        | (((v_sync_offset >> 4) & 0x03) << 2)
+        | ((v_sync_width >> 4) & 0x03),
+        h_size_mm & 0xFF,
+        v_size_mm & 0xFF,
+        ((h_size_mm >> 8) << 4) | (v_size_mm >> 8),
+        0,     # H border
+        0,     # V border
+        0x18,  # Non-interlaced, digital separate sync
+    )
 
     # Display product name descriptor
-    name_bytes = display_name[:13].encode("ascii")
-    name_bytes = name_bytes + b" " * (13 - len(name_bytes))
-    edid[72:90] = [0x00, 0x00, 0x00, 0xFC, 0x00] + list(name_bytes)
-
-    # Display range limits
-    min_v_rate = max(24, refresh_rate - 20)
-    max_v_rate = refresh_rate + 20
-    edid[90:108] = [
-        0x00, 0x00, 0x00, 0xFD, 0x00,
-        min_v_rate, max_v_rate,
-        30, 160,   # H rate (30-160 kHz)
-        220,       # Max pixel clock (2200 MHz)
-        0x00, 0x0A,
-        0x20, 0x20, 0x20, 0x20, 0x20, 0x20,
-    ]
+    edid[77:90] = display_name[:13].encode("ascii").ljust(13)
 
-    # Dummy descriptor
-    edid[108:126] = [0x00, 0x00, 0x00, 0x10, 0x00] + [0x00] * 13
-
-    # Extension flag
-    edid[126] = 1  # 1 extension block
+    # Display range limits (min/max V rate)
+    edid[95:97] = bytes((max(24, refresh_rate - 20), refresh_rate + 20))
 
     # Checksum for base block
-    edid[127] = calculate_checksum(edid[0:127])
+    edid[127] = calculate_checksum(memoryview(edid)[0:127])
 
     # ===== CEA-861 EXTENSION BLOCK (128 bytes) =====
 
-    cea_start = 128
-
-    edid[cea_start] = 0x02      # CEA-861 tag
-    edid[cea_start + 1] = 0x03  # Revision 3
-
-    offset = cea_start + 4
-
-    if enable_hdr:
-        # Colorimetry Data Block
-        edid[offset] = 0xE3
-        edid[offset + 1] = 0x05  # Extended tag = Colorimetry
-        edid[offset + 2] = 0xE0  # BT2020RGB, BT2020YCC, BT2020cYCC
-        edid[offset + 3] = 0x00
-        offset += 4
-
-        # HDR Static Metadata Data Block
-        edid[offset] = 0xE6
-        edid[offset + 1] = 0x06  # Extended tag = HDR Static Metadata
-        edid[offset + 2] = 0x07  # SDR + HDR + PQ
-        edid[offset + 3] = 0x01  # Static metadata descriptor type 1
-        edid[offset + 4] = 0x78  # Max luminance: 1000 cd/m²
-        edid[offset + 5] = 0x5A  # Max frame-avg: 400 cd/m²
-        edid[offset + 6] = 0x32  # Min luminance: 0.05 cd/m²
-        offset += 7
-
-    # Video Capability Data Block
-    edid[offset] = 0xE2
-    edid[offset + 1] = 0x00  # Extended tag = Video Capability
-    edid[offset + 2] = 0x00
-    offset += 3
-
-    # HDMI Forum Vendor Specific Data Block
-    edid[offset] = 0x67
-    edid[offset + 1] = 0xD8  # IEEE OUI for HDMI Forum
-    edid[offset + 2] = 0x5D
-    edid[offset + 3] = 0xC4
-    edid[offset + 4] = 0x01  # Version
-    edid[offset + 5] = 0x78  # Max TMDS: 600 MHz
-    edid[offset + 6] = 0x00
-    edid[offset + 7] = 0x00
-    offset += 8
-
-    # DTD offset
-    edid[cea_start + 2] = offset - cea_start
-
-    # Support flags
-    edid[cea_start + 3] = 0x70  # Underscan, Basic Audio, YCbCr 4:4:4
-
-    # Duplicate DTD from base block
-    if offset + 18 <= 255:
-        for i in range(18):
-            edid[offset + i] = edid[54 + i]
-        offset += 18
-
-    # Pad remaining
-    while offset < 255:
-        edid[offset] = 0x00
-        offset += 1
+    # Data blocks come from the template; duplicate the base block DTD at the
+    # template's DTD offset. The rest of the block is already zero padding.
+    dtd_start = 128 + edid[130]
+    edid[dtd_start:dtd_start + 18] = edid[54:72]
 
     # CEA checksum
-    edid[255] = calculate_checksum(edid[128:255])
+    edid[255] = calculate_checksum(memoryview(edid)[128:255])
 
-    return bytes(edid)
+    return _freeze(edid)
@@ -5,9 +5,22 @@ Pixel clock calculations and EDID checksum utilities.
 from __future__ import annotations
 
 
-def calculate_checksum(data: bytes | bytearray) -> int:
+def calculate_checksum(data: bytes | bytearray | memoryview) -> int:
     """Calculate EDID checksum (sum of all bytes must be 0 mod 256)."""
-    return (256 - (sum(data) % 256)) % 256
+    return -sum(data) & 0xFF
+
+
+def calculate_blanking(width: int, height: int, refresh_rate: int) -> tuple[int, int, int, int]:
+    """
+    Blanking used for custom modes: 8% (min 80px) horizontal, 2.5% (min 23
+    lines) vertical. Returns (h_blank, h_total, v_blank, pixel_clock_hz).
+    """
+    h_blank = max(80, int(width * 0.08))
+    h_total = width + h_blank
+    v_blank = max(23, int(height * 0.025))
+    pixel_clock_hz = h_total * (height + v_blank) * refresh_rate
+
+    return (h_blank, h_total, v_blank, pixel_clock_hz)
 
 
 def check_if_calculation_breaks(width: int, height: int, refresh_rate: int) -> bool:
@@ -16,11 +29,8 @@ def check_if_calculation_breaks(width: int, height: int, refresh_rate: int) -> b
     the EDID pixel clock limit (655.35 MHz).
     Returns True if it would break.
     """
-    h_blank = max(80, int(width * 0.08))
-    h_total = width + h_blank
-    v_blank_estimate = max(23, int(height * 0.025))
-    pixel_clock_hz = h_total * (height + v_blank_estimate) * refresh_rate
-    pixel_clock = int(pixel_clock_hz / 10000)
+    _, _, _, pixel_clock_hz = calculate_blanking(width, height, refresh_rate)
+    pixel_clock = pixel_clock_hz // 10000
 
     return pixel_clock > 65535
 
@@ -30,11 +40,8 @@ def get_pixel_clock_info(width: int, height: int, refresh_rate: int) -> tuple[fl
     Get detailed pixel clock information for diagnostics.
     Returns (pixel_clock_mhz, max_mhz, would_break).
     """
-    h_blank = max(80, int(width * 0.08))
-    h_total = width + h_blank
-    v_blank_estimate = max(23, int(height * 0.025))
-    pixel_clock_hz = h_total * (height + v_blank_estimate) * refresh_rate
-    pixel_clock = int(pixel_clock_hz / 10000)
+    _, _, _, pixel_clock_hz = calculate_blanking(width, height, refresh_rate)
+    pixel_clock = pixel_clock_hz // 10000
     max_pixel_clock = 65535
 
     pixel_clock_mhz = pixel_clock_hz / 1000000
@@ -4,215 +4,272 @@ CEA-861 Video Identification Code (VIC) standard resolutions and lookup.
 
 from __future__ import annotations
 
-# Format: VIC: (width, height, refresh_rate, name)
-VIC_RESOLUTIONS = {
-    1: (640, 480, 60, "DMT0659"),
-    2: (720, 480, 60, "480p"),
-    3: (720, 480, 60, "480pH"),
-    4: (1280, 720, 60, "720p"),
-    5: (1920, 1080, 60, "1080i"),
-    6: (1440, 480, 60, "480i"),
-    7: (1440, 480, 60, "480iH"),
-    8: (1440, 240, 60, "240p"),
-    9: (1440, 240, 60, "240pH"),
-    10: (2880, 480, 60, "480i4x"),
-    11: (2880, 480, 60, "480i4xH"),
-    12: (2880, 240, 60, "240p4x"),
-    13: (2880, 240, 60, "240p4xH"),
-    14: (1440, 480, 60, "480p2x"),
-    15: (1440, 480, 60, "480p2xH"),
-    16: (1920, 1080, 60, "1080p"),
-    17: (720, 576, 50, "576p"),
-    18: (720, 576, 50, "576pH"),
-    19: (1280, 720, 50, "720p50"),
-    20: (1920, 1080, 50, "1080i25"),
-    21: (1440, 576, 50, "576i"),
-    22: (1440, 576, 50, "576iH"),
-    23: (1440, 288, 50, "288p"),
-    24: (1440, 288, 50, "288pH"),
-    25: (2880, 576, 50, "576i4x"),
-    26: (2880, 576, 50, "576i4xH"),
-    27: (2880, 288, 50, "288p4x"),
-    28: (2880, 288, 50, "288p4xH"),
-    29: (1440, 576, 50, "576p2x"),
-    30: (1440, 576, 50, "576p2xH"),
-    31: (1920, 1080, 50, "1080p50"),
-    32: (1920, 1080, 24, "1080p24"),
-    33: (1920, 1080, 25, "1080p25"),
-    34: (1920, 1080, 30, "1080p30"),
-    35: (2880, 480, 60, "480p4x"),
-    36: (2880, 480, 60, "480p4xH"),
-    37: (2880, 576, 50, "576p4x"),
-    38: (2880, 576, 50, "576p4xH"),
-    39: (1920, 1080, 50, "1080i25_2"),
-    40: (1920, 1080, 100, "1080i50"),
-    41: (1280, 720, 100, "720p100"),
-    42: (720, 576, 100, "576p100"),
-    43: (720, 576, 100, "576p100H"),
-    44: (1440, 576, 100, "576i50"),
-    45: (1440, 576, 100, "576i50H"),
-    46: (1920, 1080, 120, "1080i60"),
-    47: (1280, 720, 120, "720p120"),
-    48: (720, 480, 120, "480p119"),
-    49: (720, 480, 120, "480p119H"),
-    50: (1440, 480, 120, "480i59"),
-    51: (1440, 480, 120, "480i59H"),
-    52: (720, 576, 200, "576p200"),
-    53: (720, 576, 200, "576p200H"),
-    54: (1440, 288, 200, "576i100"),
-    55: (1440, 288, 200, "576i100H"),
-    56: (720, 480, 240, "480p239"),
-    57: (720, 480, 240, "480p239H"),
-    58: (1440, 240, 240, "480i119"),
-    59: (1440, 240, 240, "480i119H"),
-    60: (1280, 720, 24, "720p24"),
-    61: (1280, 720, 25, "720p25"),
-    62: (1280, 720, 30, "720p30"),
-    63: (1920, 1080, 120, "1080p120"),
-    64: (1920, 1080, 100, "1080p100"),
-    65: (1280, 720, 24, "720p24_64:27"),
-    66: (1280, 720, 25, "720p25_64:27"),
-    67: (1280, 720, 30, "720p30_64:27"),
-    68: (1280, 720, 50, "720p50_64:27"),
-    69: (1280, 720, 60, "720p_64:27"),
-    70: (1280, 720, 100, "720p100_64:27"),
-    71: (1280, 720, 120, "720p120_64:27"),
-    72: (1920, 1080, 24, "1080p24_64:27"),
-    73: (1920, 1080, 25, "1080p25_64:27"),
-    74: (1920, 1080, 30, "1080p30_64:27"),
-    75: (1920, 1080, 50, "1080p50_64:27"),
-    76: (1920, 1080, 60, "1080p_64:27"),
-    77: (1920, 1080, 100, "1080p100_64:27"),
-    78: (1920, 1080, 120, "1080p120_64:27"),
-    79: (1680, 720, 24, "720p2x24"),
-    80: (1680, 720, 25, "720p2x25"),
-    81: (1680, 720, 30, "720p2x30"),
-    82: (1680, 720, 50, "720p2x50"),
-    83: (1680, 720, 60, "720p2x"),
-    84: (1680, 720, 100, "720p2x100"),
-    85: (1680, 720, 120, "720p2x120"),
-    86: (2560, 1080, 24, "1080p2x24"),
-    87: (2560, 1080, 25, "1080p2x25"),
-    88: (2560, 1080, 30, "1080p2x30"),
-    89: (2560, 1080, 50, "1080p2x50"),
-    90: (2560, 1080, 60, "1080p2x"),
-    91: (2560, 1080, 100, "1080p2x100"),
-    92: (2560, 1080, 120, "1080p2x120"),
-    93: (3840, 2160, 24, "2160p24"),
-    94: (3840, 2160, 25, "2160p25"),
-    95: (3840, 2160, 30, "2160p30"),
-    96: (3840, 2160, 50, "2160p50"),
-    97: (3840, 2160, 60, "2160p60"),
-    98: (4096, 2160, 24, "2160p24_256:135"),
-    99: (4096, 2160, 25, "2160p25_256:135"),
-    100: (4096, 2160, 30, "2160p30_256:135"),
-    101: (4096, 2160, 50, "2160p50_256:135"),
-    102: (4096, 2160, 60, "2160p_256:135"),
-    103: (3840, 2160, 24, "2160p24_64:27"),
-    104: (3840, 2160, 25, "2160p25_64:27"),
-    105: (3840, 2160, 30, "2160p30_64:27"),
-    106: (3840, 2160, 50, "2160p50_64:27"),
-    107: (3840, 2160, 60, "2160p_64:27"),
-    108: (1280, 720, 48, "720p48"),
-    109: (1280, 720, 48, "720p48_64:27"),
-    110: (1680, 720, 48, "720p2x48"),
-    111: (1920, 1080, 48, "1080p48"),
-    112: (1920, 1080, 48, "1080p48_64:27"),
-    113: (2560, 1080, 48, "1080p2x48"),
-    114: (3840, 2160, 48, "2160p48"),
-    115: (4096, 2160, 48, "2160p48_256:135"),
-    116: (3840, 2160, 48, "2160p48_64:27"),
-    117: (3840, 2160, 100, "2160p100"),
-    118: (3840, 2160, 120, "2160p120"),
-    119: (3840, 2160, 100, "2160p100_64:27"),
-    120: (3840, 2160, 120, "2160p120_64:27"),
-    121: (5120, 2160, 24, "2160p2x24"),
-    122: (5120, 2160, 25, "2160p2x25"),
-    123: (5120, 2160, 30, "2160p2x30"),
-    124: (5120, 2160, 48, "2160p2x48"),
-    125: (5120, 2160, 50, "2160p2x50"),
-    126: (5120, 2160, 60, "2160p2x"),
-    127: (5120, 2160, 100, "2160p2x100"),
-    193: (5120, 2160, 120, "2160p2x120"),
-    194: (7680, 4320, 24, "4320p24"),
-    195: (7680, 4320, 25, "4320p25"),
-    196: (7680, 4320, 30, "4320p30"),
-    197: (7680, 4320, 48, "4320p48"),
-    198: (7680, 4320, 50, "4320p50"),
-    199: (7680, 4320, 60, "4320p"),
-    200: (7680, 4320, 100, "4320p100"),
-    201: (7680, 4320, 120, "4320p120"),
-    202: (7680, 4320, 24, "4320p24_64:27"),
-    203: (7680, 4320, 25, "4320p25_64:27"),
-    204: (7680, 4320, 30, "4320p30_64:27"),
-    205: (7680, 4320, 48, "4320p48_64:27"),
-    206: (7680, 4320, 50, "4320p50_64:27"),
-    207: (7680, 4320, 60, "4320p_64:27"),
-    208: (7680, 4320, 100, "4320p100_64:27"),
-    209: (7680, 4320, 120, "4320p120_64:27"),
-    210: (10240, 4320, 24, "4320p2x24"),
-    211: (10240, 4320, 25, "4320p2x25"),
-    212: (10240, 4320, 30, "4320p2x30"),
-    213: (10240, 4320, 48, "4320p2x48"),
-    214: (10240, 4320, 50, "4320p2x50"),
-    215: (10240, 4320, 60, "4320p2x"),
-    216: (10240, 4320, 100, "4320p2x100"),
-    217: (10240, 4320, 120, "4320p2x120"),
-    218: (4096, 2160, 100, "2160p100_256:135"),
-    219: (4096, 2160, 120, "2160p120_256:135"),
+import math
+from collections.abc import Iterable
+
+from src.edid.timing import get_pixel_clock_info
+
+# Format: (vic, width, height, refresh_rate, name)
+VIC_ROWS: tuple[tuple[int, int, int, int, str], ...] = (
+    (1, 640, 480, 60, "DMT0659"),
+    (2, 720, 480, 60, "480p"),
+    (3, 720, 480, 60, "480pH"),
+    (4, 1280, 720, 60, "720p"),
+    (5, 1920, 1080, 60, "1080i"),
+    (6, 1440, 480, 60, "480i"),
+    (7, 1440, 480, 60, "480iH"),
+    (8, 1440, 240, 60, "240p"),
+    (9, 1440, 240, 60, "240pH"),
+    (10, 2880, 480, 60, "480i4x"),
+    (11, 2880, 480, 60, "480i4xH"),
+    (12, 2880, 240, 60, "240p4x"),
+    (13, 2880, 240, 60, "240p4xH"),
+    (14, 1440, 480, 60, "480p2x"),
+    (15, 1440, 480, 60, "480p2xH"),
+    (16, 1920, 1080, 60, "1080p"),
+    (17, 720, 576, 50, "576p"),
+    (18, 720, 576, 50, "576pH"),
+    (19, 1280, 720, 50, "720p50"),
+    (20, 1920, 1080, 50, "1080i25"),
+    (21, 1440, 576, 50, "576i"),
+    (22, 1440, 576, 50, "576iH"),
+    (23, 1440, 288, 50, "288p"),
+    (24, 1440, 288, 50, "288pH"),
+    (25, 2880, 576, 50, "576i4x"),
+    (26, 2880, 576, 50, "576i4xH"),
+    (27, 2880, 288, 50, "288p4x"),
+    (28, 2880, 288, 50, "288p4xH"),
+    (29, 1440, 576, 50, "576p2x"),
+    (30, 1440, 576, 50, "576p2xH"),
+    (31, 1920, 1080, 50, "1080p50"),
+    (32, 1920, 1080, 24, "1080p24"),
+    (33, 1920, 1080, 25, "1080p25"),
+    (34, 1920, 1080, 30, "1080p30"),
+    (35, 2880, 480, 60, "480p4x"),
+    (36, 2880, 480, 60, "480p4xH"),
+    (37, 2880, 576, 50, "576p4x"),
+    (38, 2880, 576, 50, "576p4xH"),
+    (39, 1920, 1080, 50, "1080i25_2"),
+    (40, 1920, 1080, 100, "1080i50"),
+    (41, 1280, 720, 100, "720p100"),
+    (42, 720, 576, 100, "576p100"),
+    (43, 720, 576, 100, "576p100H"),
+    (44, 1440, 576, 100, "576i50"),
+    (45, 1440, 576, 100, "576i50H"),
+    (46, 1920, 1080, 120, "1080i60"),
+    (47, 1280, 720, 120, "720p120"),
+    (48, 720, 480, 120, "480p119"),
+    (49, 720, 480, 120, "480p119H"),
+    (50, 1440, 480, 120, "480i59"),
+    (51, 1440, 480, 120, "480i59H"),
+    (52, 720, 576, 200, "576p200"),
+    (53, 720, 576, 200, "576p200H"),
+    (54, 1440, 288, 200, "576i100"),
+    (55, 1440, 288, 200, "576i100H"),
+    (56, 720, 480, 240, "480p239"),
+    (57, 720, 480, 240, "480p239H"),
+    (58, 1440, 240, 240, "480i119"),
+    (59, 1440, 240, 240, "480i119H"),
+    (60, 1280, 720, 24, "720p24"),
+    (61, 1280, 720, 25, "720p25"),
+    (62, 1280, 720, 30, "720p30"),
+    (63, 1920, 1080, 120, "1080p120"),
+    (64, 1920, 1080, 100, "1080p100"),
+    (65, 1280, 720, 24, "720p24_64:27"),
+    (66, 1280, 720, 25, "720p25_64:27"),
+    (67, 1280, 720, 30, "720p30_64:27"),
+    (68, 1280, 720, 50, "720p50_64:27"),
+    (69, 1280, 720, 60, "720p_64:27"),
+    (70, 1280, 720, 100, "720p100_64:27"),
+    (71, 1280, 720, 120, "720p120_64:27"),
+    (72, 1920, 1080, 24, "1080p24_64:27"),
+    (73, 1920, 1080, 25, "1080p25_64:27"),
+    (74, 1920, 1080, 30, "1080p30_64:27"),
+    (75, 1920, 1080, 50, "1080p50_64:27"),
+    (76, 1920, 1080, 60, "1080p_64:27"),
+    (77, 1920, 1080, 100, "1080p100_64:27"),
+    (78, 1920, 1080, 120, "1080p120_64:27"),
+    (79, 1680, 720, 24, "720p2x24"),
+    (80, 1680, 720, 25, "720p2x25"),
+    (81, 1680, 720, 30, "720p2x30"),
+    (82, 1680, 720, 50, "720p2x50"),
+    (83, 1680, 720, 60, "720p2x"),
+    (84, 1680, 720, 100, "720p2x100"),
+    (85, 1680, 720, 120, "720p2x120"),
+    (86, 2560, 1080, 24, "1080p2x24"),
+    (87, 2560, 1080, 25, "1080p2x25"),
+    (88, 2560, 1080, 30, "1080p2x30"),
+    (89, 2560, 1080, 50, "1080p2x50"),
+    (90, 2560, 1080, 60, "1080p2x"),
+    (91, 2560, 1080, 100, "1080p2x100"),
+    (92, 2560, 1080, 120, "1080p2x120"),
+    (93, 3840, 2160, 24, "2160p24"),
+    (94, 3840, 2160, 25, "2160p25"),
+    (95, 3840, 2160, 30, "2160p30"),
+    (96, 3840, 2160, 50, "2160p50"),
+    (97, 3840, 2160, 60, "2160p60"),
+    (98, 4096, 2160, 24, "2160p24_256:135"),
+    (99, 4096, 2160, 25, "2160p25_256:135"),
+    (100, 4096, 2160, 30, "2160p30_256:135"),
+    (101, 4096, 2160, 50, "2160p50_256:135"),
+    (102, 4096, 2160, 60, "2160p_256:135"),
+    (103, 3840, 2160, 24, "2160p24_64:27"),
+    (104, 3840, 2160, 25, "2160p25_64:27"),
+    (105, 3840, 2160, 30, "2160p30_64:27"),
+    (106, 3840, 2160, 50, "2160p50_64:27"),
+    (107, 3840, 2160, 60, "2160p_64:27"),
+    (108, 1280, 720, 48, "720p48"),
+    (109, 1280, 720, 48, "720p48_64:27"),
+    (110, 1680, 720, 48, "720p2x48"),
+    (111, 1920, 1080, 48, "1080p48"),
+    (112, 1920, 1080, 48, "1080p48_64:27"),
+    (113, 2560, 1080, 48, "1080p2x48"),
+    (114, 3840, 2160, 48, "2160p48"),
+    (115, 4096, 2160, 48, "2160p48_256:135"),
+    (116, 3840, 2160, 48, "2160p48_64:27"),
+    (117, 3840, 2160, 100, "2160p100"),
+    (118, 3840, 2160, 120, "2160p120"),
+    (119, 3840, 2160, 100, "2160p100_64:27"),
+    (120, 3840, 2160, 120, "2160p120_64:27"),
+    (121, 5120, 2160, 24, "2160p2x24"),
+    (122, 5120, 2160, 25, "2160p2x25"),
+    (123, 5120, 2160, 30, "2160p2x30"),
+    (124, 5120, 2160, 48, "2160p2x48"),
+    (125, 5120, 2160, 50, "2160p2x50"),
+    (126, 5120, 2160, 60, "2160p2x"),
+    (127, 5120, 2160, 100, "2160p2x100"),
+    (193, 5120, 2160, 120, "2160p2x120"),
+    (194, 7680, 4320, 24, "4320p24"),
+    (195, 7680, 4320, 25, "4320p25"),
+    (196, 7680, 4320, 30, "4320p30"),
+    (197, 7680, 4320, 48, "4320p48"),
+    (198, 7680, 4320, 50, "4320p50"),
+    (199, 7680, 4320, 60, "4320p"),
+    (200, 7680, 4320, 100, "4320p100"),
+    (201, 7680, 4320, 120, "4320p120"),
+    (202, 7680, 4320, 24, "4320p24_64:27"),
+    (203, 7680, 4320, 25, "4320p25_64:27"),
+    (204, 7680, 4320, 30, "4320p30_64:27"),
+    (205, 7680, 4320, 48, "4320p48_64:27"),
+    (206, 7680, 4320, 50, "4320p50_64:27"),
+    (207, 7680, 4320, 60, "4320p_64:27"),
+    (208, 7680, 4320, 100, "4320p100_64:27"),
+    (209, 7680, 4320, 120, "4320p120_64:27"),
+    (210, 10240, 4320, 24, "4320p2x24"),
+    (211, 10240, 4320, 25, "4320p2x25"),
+    (212, 10240, 4320, 30, "4320p2x30"),
+    (213, 10240, 4320, 48, "4320p2x48"),
+    (214, 10240, 4320, 50, "4320p2x50"),
+    (215, 10240, 4320, 60, "4320p2x"),
+    (216, 10240, 4320, 100, "4320p2x100"),
+    (217, 10240, 4320, 120, "4320p2x120"),
+    (218, 4096, 2160, 100, "2160p100_256:135"),
+    (219, 4096, 2160, 120, "2160p120_256:135"),
+)
+
+# Lookup by VIC code: VIC: (width, height, refresh_rate, name)
+VIC_RESOLUTIONS: dict[int, tuple[int, int, int, str]] = {
+    vic: (width, height, refresh, name) for vic, width, height, refresh, name in VIC_ROWS
 }
 
+# Column-wise (struct-of-arrays) view of VIC_ROWS, built once at import so the
+# lookup loop walks flat tuples instead of unpacking rows.
+_VIC_CODES, _VIC_WIDTHS, _VIC_HEIGHTS, _VIC_REFRESH, _VIC_NAMES = zip(*VIC_ROWS)
 
-VIC_RESOLUTIONS: dict[int, tuple[int, int, int, str]]
+# Per-row pixel count and aspect ratio, so lookups do no per-row division
+_VIC_PIXELS = tuple(w * h for w, h in zip(_VIC_WIDTHS, _VIC_HEIGHTS))
+_VIC_ASPECT = tuple(w / h for w, h in zip(_VIC_WIDTHS, _VIC_HEIGHTS))
 
+# Pixel clock (MHz) of each VIC and whether it fits the EDID limit — constant per row
+_VIC_CLOCK_MHZ, _, _VIC_BREAKS = zip(
+    *(get_pixel_clock_info(w, h, r) for w, h, r in zip(_VIC_WIDTHS, _VIC_HEIGHTS, _VIC_REFRESH))
+)
+_VIC_VALID = tuple(not breaks for breaks in _VIC_BREAKS)
 
-def find_best_vic_resolution(
-    target_width: int,
-    target_height: int,
-    target_refresh: int,
-) -> tuple[int, int, int, int, str] | None:
-    """
-    Find the next best VIC resolution from the standard list.
-    Prioritizes: 1) Refresh rate, 2) Resolution, 3) Aspect ratio
 
-    Returns:
-        Tuple of (width, height, refresh_rate, vic_code, name) or None
-    """
-    from src.edid.timing import check_if_calculation_breaks
+# Row indices grouped by refresh rate, for the exact-refresh fast path
+_VIC_BY_REFRESH: dict[int, tuple[int, ...]] = {
+    r: tuple(i for i, rr in enumerate(_VIC_REFRESH) if rr == r)
+    for r in dict.fromkeys(_VIC_REFRESH)
+}
 
-    target_pixels = target_width * target_height
-    target_aspect = target_width / target_height
+# Score weight of one Hz of refresh mismatch
+_REFRESH_WEIGHT = 100000
 
-    candidates = []
 
-    for vic, (width, height, refresh, name) in VIC_RESOLUTIONS.items():
-        pixels = width * height
-        aspect = width / height
+def _best_row(
+    rows: Iterable[int],
+    target_pixels: int,
+    target_aspect: float,
+    target_refresh: int,
+) -> tuple[int | None, float]:
+    """
+    Score the valid VIC rows among `rows` and return (index, score) of the
+    lowest one. Ties keep the first row; (None, inf) if none is valid.
+    """
+    inv_target_pixels = 1.0 / target_pixels
+
+    best_index = None
+    best_score = math.inf
 
-        if check_if_calculation_breaks(width, height, refresh):
+    for i in rows:
+        if not _VIC_VALID[i]:
             continue
 
-        refresh_diff = abs(refresh - target_refresh)
-        resolution_diff = abs(pixels - target_pixels) / target_pixels
-        aspect_diff = abs(aspect - target_aspect)
+        refresh_diff = abs(_VIC_REFRESH[i] - target_refresh)
+        resolution_diff = abs(_VIC_PIXELS[i] - target_pixels) * inv_target_pixels
+        aspect_diff = abs(_VIC_ASPECT[i] - target_aspect)
         aspect_penalty = aspect_diff * 500
 
         if aspect_diff > 0.3:
             aspect_penalty += (aspect_diff - 0.3) * 2000
 
-        score = (refresh_diff * 100000) + (resolution_diff * 1000) + aspect_penalty
-        candidates.append((vic, score, width, height, refresh, name, aspect))
+        score = (refresh_diff * _REFRESH_WEIGHT) + (resolution_diff * 1000) + aspect_penalty
+        if score < best_score:
+            best_score = score
+            best_index = i
+
+    return best_index, best_score
 
-    candidates.sort(key=lambda x: x[1])
 
-    if candidates:
-        best = candidates[0]
-        vic, score, width, height, refresh, name, aspect = best
-        print(f"\nBest VIC match: VIC {vic} - {name}")
-        print(f"  Resolution: {width}x{height} @ {refresh}Hz (aspect: {aspect:.2f})")
-        print(
-            f"  Requested:  {target_width}x{target_height} @ {target_refresh}Hz (aspect: {target_aspect:.2f})"
+def find_best_vic_resolution(
+    target_width: int,
+    target_height: int,
+    target_refresh: int,
+) -> tuple[int, int, int, int, str, float] | None:
+    """
+    Find the next best VIC resolution from the standard list.
+    Prioritizes: 1) Refresh rate, 2) Resolution, 3) Aspect ratio
+
+    Returns:
+        Tuple of (width, height, refresh_rate, vic_code, name, pixel_clock_mhz) or None
+    """
+    target_pixels = target_width * target_height
+    target_aspect = target_width / target_height
+
+    # Every row with a refresh mismatch scores at least _REFRESH_WEIGHT, so an
+    # exact-refresh row scoring below that wins outright. Only fall back to the
+    # full table when no such row exists.
+    best_index, best_score = _best_row(
+        _VIC_BY_REFRESH.get(target_refresh, ()), target_pixels, target_aspect, target_refresh
+    )
+    if best_score >= _REFRESH_WEIGHT:
+        best_index, best_score = _best_row(
+            range(len(_VIC_CODES)), target_pixels, target_aspect, target_refresh
         )
-        return (width, height, refresh, vic, name)
 
-    return None
+    if best_index is None:
+        return None
+
+    vic = _VIC_CODES[best_index]
+    width = _VIC_WIDTHS[best_index]
+    height = _VIC_HEIGHTS[best_index]
+    refresh = _VIC_REFRESH[best_index]
+    name = _VIC_NAMES[best_index]
+    aspect = _VIC_ASPECT[best_index]
+    print(f"\nBest VIC match: VIC {vic} - {name}")
+    print(f"  Resolution: {width}x{height} @ {refresh}Hz (aspect: {aspect:.2f})")
+    print(
+        f"  Requested:  {target_width}x{target_height} @ {target_refresh}Hz (aspect: {target_aspect:.2f})"
+    )
+    return (width, height, refresh, vic, name, _VIC_CLOCK_MHZ[best_index])
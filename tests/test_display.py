@@ -1,7 +1,7 @@
 """Tests for src/display.py"""
 
+import json
 from pathlib import Path
-from subprocess import CompletedProcess
 from unittest.mock import MagicMock, call, patch
 
 import pytest
@@ -9,14 +9,6 @@ import pytest
 from src.display import connect, disconnect
 
 
-def _ok_run(cmd: str = "") -> CompletedProcess:
-    return CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
-
-
-def _fail_run(cmd: str = "") -> CompletedProcess:
-    return CompletedProcess(args=cmd, returncode=1, stdout="", stderr="error")
-
-
 @pytest.fixture(autouse=True)
 def _default_to_legacy_drm_path():
     """Keep existing tests deterministic on NVIDIA/Hyprland dev machines."""
@@ -33,7 +25,7 @@ class TestConnect:
             "src.display.get_card_name_from_device": "card1",
             "src.display.get_connected_displays": [],
             "src.display.find_empty_slot": ("DP-1", Path("/sys/kernel/debug/dri/0000:01:00.0")),
-            "src.display.run_command": _ok_run(),
+            "src.display.write_sysfs": None,
             "src.display.release_crtc": True,
             "src.display.force_crtc_assignment": True,
             "src.display.wait_for_output_ready": (True, "1920x1080"),
@@ -49,7 +41,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=[]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
@@ -84,7 +76,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=[]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
@@ -106,27 +98,45 @@ class TestConnect:
         assert "No empty" in capsys.readouterr().out
 
     def test_returns_false_when_edid_override_fails(self, tmp_path, capsys):
+        mock_write = MagicMock(return_value="Permission denied")
         with patch("src.display.SCRIPT_DIR", tmp_path), \
              patch("src.display.get_pixel_clock_info", return_value=(100.0, 655.35, False)), \
              patch("src.display.get_drm_devices", return_value=[Path("/sys/kernel/debug/dri/0000:01:00.0")]), \
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=[]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_fail_run()), \
+             patch("src.display.write_sysfs", mock_write), \
              patch("src.display.create_edid", return_value=b"\x00" * 256):
             result = connect(1920, 1080, 60)
         assert result is False
+        assert "Error overriding EDID: Permission denied" in capsys.readouterr().out
+        paths = [call_args[0][0] for call_args in mock_write.call_args_list]
+        assert tmp_path / "custom_edid.bin" not in paths
 
-    def test_returns_false_when_enable_display_fails(self, tmp_path, capsys):
-        call_count = [0]
+    def test_edid_override_written_from_memory(self, tmp_path):
+        edid = bytes(range(256))
+        mock_write = MagicMock(return_value=None)
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.get_pixel_clock_info", return_value=(100.0, 655.35, False)), \
+             patch("src.display.get_drm_devices", return_value=[Path("/sys/kernel/debug/dri/0000:01:00.0")]), \
+             patch("src.display.get_card_name_from_device", return_value="card1"), \
+             patch("src.display.get_connected_displays", return_value=[]), \
+             patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
+             patch("src.display.write_sysfs", mock_write), \
+             patch("src.display.force_crtc_assignment", return_value=True), \
+             patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
+             patch("src.display.clear_kwin_output_config"), \
+             patch("src.display.create_edid", return_value=edid):
+            connect(1920, 1080, 60)
+        mock_write.assert_any_call(tmp_path / "DP-1" / "edid_override", edid)
+        mock_write.assert_any_call(tmp_path / "custom_edid.bin", edid)
 
-        def run_side(cmd):
-            call_count[0] += 1
-            # First call (EDID override) succeeds; second (turn off display n/a here);
-            # third (turn on virtual) fails
-            if call_count[0] == 1:
-                return _ok_run()
-            return _fail_run()
+    def test_edid_copy_failure_does_not_abort_connect(self, tmp_path, capsys):
+        def write_side(path, data):
+            # Everything succeeds except the debug copy
+            if str(path).endswith("custom_edid.bin"):
+                return "No space left on device"
+            return None
 
         with patch("src.display.SCRIPT_DIR", tmp_path), \
              patch("src.display.get_pixel_clock_info", return_value=(100.0, 655.35, False)), \
@@ -134,7 +144,29 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=[]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", side_effect=run_side), \
+             patch("src.display.write_sysfs", side_effect=write_side), \
+             patch("src.display.force_crtc_assignment", return_value=True), \
+             patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
+             patch("src.display.clear_kwin_output_config"), \
+             patch("src.display.create_edid", return_value=b"\x00" * 256):
+            result = connect(1920, 1080, 60)
+        assert result is True
+        assert "Warning: Could not save EDID copy: No space left on device" in capsys.readouterr().out
+
+    def test_returns_false_when_enable_display_fails(self, tmp_path, capsys):
+        def write_side(path, data):
+            # EDID override succeeds; turning on the virtual display fails
+            if str(path).endswith("/status"):
+                return "Invalid argument"
+            return None
+
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.get_pixel_clock_info", return_value=(100.0, 655.35, False)), \
+             patch("src.display.get_drm_devices", return_value=[Path("/sys/kernel/debug/dri/0000:01:00.0")]), \
+             patch("src.display.get_card_name_from_device", return_value="card1"), \
+             patch("src.display.get_connected_displays", return_value=[]), \
+             patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
+             patch("src.display.write_sysfs", side_effect=write_side), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.clear_kwin_output_config"), \
              patch("src.display.create_edid", return_value=b"\x00" * 256):
@@ -142,7 +174,7 @@ class TestConnect:
         assert result is False
 
     def test_pixel_clock_fallback_to_vic(self, tmp_path, capsys):
-        vic_result = (1920, 1080, 60, 16, "1080p")
+        vic_result = (1920, 1080, 60, 16, "1080p", 142.3)
         with patch("src.display.SCRIPT_DIR", tmp_path), \
              patch("src.display.get_pixel_clock_info", return_value=(700.0, 655.35, True)), \
              patch("src.display.find_best_vic_resolution", return_value=vic_result), \
@@ -150,7 +182,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=[]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
@@ -160,6 +192,34 @@ class TestConnect:
         assert result is True
         out = capsys.readouterr().out
         assert "Falling back to VIC" in out
+        assert "New pixel clock: 142.30 MHz" in out
+
+    def test_vic_report_printed_between_step1_blocks(self, tmp_path, capsys):
+        def fake_vic(w, h, r):
+            print("Best VIC match: VIC 16 - 1080p")
+            return (1920, 1080, 60, 16, "1080p", 142.3)
+
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.get_pixel_clock_info", return_value=(700.0, 655.35, True)), \
+             patch("src.display.find_best_vic_resolution", side_effect=fake_vic), \
+             patch("src.display.get_drm_devices", return_value=[]), \
+             patch("src.display.create_edid", return_value=b"\x00" * 256):
+            _ = connect(1920, 1080, 120)
+        out = capsys.readouterr().out
+        assert out.index("Finding best VIC") < out.index("Best VIC match") < out.index("Falling back to VIC")
+
+    def test_step1_diagnostics_printed_when_create_edid_raises(self, tmp_path, capsys):
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.get_pixel_clock_info", return_value=(300.0, 655.35, False)), \
+             patch("src.display.create_edid", side_effect=ValueError("bad mode")):
+            with pytest.raises(ValueError):
+                _ = connect(4096, 2160, 30)
+        out = capsys.readouterr().out
+        assert "Step 1: Generating custom EDID..." in out
+        assert "Requested: 4096x2160 @ 30Hz" in out
+        assert "Pixel clock: 300.00 MHz" in out
+        assert "Using custom resolution: 4096x2160 @ 30Hz" in out
+        assert "Final resolution" not in out
 
     def test_pixel_clock_no_vic_found(self, tmp_path, capsys):
         with patch("src.display.SCRIPT_DIR", tmp_path), \
@@ -169,7 +229,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=[]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
@@ -188,7 +248,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=["HDMI-1"]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", mock_release), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
@@ -205,7 +265,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=[]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.force_crtc_assignment", return_value=True) as mock_force, \
              patch("src.display.wait_for_output_ready", side_effect=ready_seq), \
@@ -222,7 +282,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=[]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(False, "")), \
@@ -248,7 +308,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", side_effect=card_name), \
              patch("src.display.get_connected_displays", side_effect=connected), \
              patch("src.display.find_empty_slot", return_value=("DP-2", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
@@ -264,7 +324,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=["HDMI-1"]), \
              patch("src.display.find_empty_slot", return_value=("DP-1", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", return_value=True), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
@@ -274,10 +334,43 @@ class TestConnect:
 
         state_file = tmp_path / "virt_display.state"
         assert state_file.exists()
-        content = state_file.read_text()
-        assert "card1" in content
-        assert "DP-1" in content
-        assert "HDMI-1" in content
+        state = json.loads(state_file.read_text())
+        assert state["card"] == "card1"
+        assert state["port"] == "DP-1"
+        assert state["previous"] == ["HDMI-1"]
+        assert state["edid_override"] == str(tmp_path / "DP-1" / "edid_override")
+
+    def test_cleans_up_stale_session(self, tmp_path, capsys):
+        stale_edid = str(tmp_path / "DP-2" / "edid_override")
+        _ = (tmp_path / "virt_display.state").write_text(
+            json.dumps({"card": "card1", "port": "DP-2", "previous": [], "edid_override": stale_edid})
+        )
+        mock_write = MagicMock(return_value=None)
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.time.sleep"), \
+             patch("src.display.get_drm_devices", return_value=[]), \
+             patch("src.display.write_sysfs", mock_write):
+            result = connect(1920, 1080, 60)
+        assert result is False
+        assert "Stale session detected (card1-DP-2)" in capsys.readouterr().out
+        mock_write.assert_any_call(stale_edid, b"")
+        mock_write.assert_any_call("/sys/class/drm/card1-DP-2/status", b"off\n")
+        assert not (tmp_path / "virt_display.state").exists()
+
+    def test_cleans_up_legacy_stale_session(self, tmp_path, capsys):
+        stale_edid = str(tmp_path / "DP-2" / "edid_override")
+        _ = (tmp_path / "virt_display.state").write_text(f"card1\nDP-2\nHDMI-1\n{stale_edid}\n{{}}")
+        mock_write = MagicMock(return_value=None)
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.time.sleep"), \
+             patch("src.display.get_drm_devices", return_value=[]), \
+             patch("src.display.write_sysfs", mock_write):
+            result = connect(1920, 1080, 60)
+        assert result is False
+        assert "Stale session detected (card1-DP-2)" in capsys.readouterr().out
+        mock_write.assert_any_call(stale_edid, b"")
+        mock_write.assert_any_call("/sys/class/drm/card1-DP-2/status", b"off\n")
+        assert not (tmp_path / "virt_display.state").exists()
 
     def test_nvidia_hyprland_safe_path_preserves_monitor_options(self, tmp_path):
         restore_specs = {
@@ -302,7 +395,7 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=["DP-1"]), \
              patch("src.display.find_empty_slot", return_value=("DP-3", tmp_path)), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.release_crtc", mock_release), \
              patch("src.display.force_crtc_assignment", mock_force), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1280x800")), \
@@ -314,12 +407,11 @@ class TestConnect:
         mock_release.assert_not_called()
         mock_force.assert_not_called()
         mock_disable.assert_called_once_with(["DP-1"])
-        content = (tmp_path / "virt_display.state").read_text()
-        assert '"bitdepth": 10' in content
-        assert '"vrr": 1' in content
+        state = json.loads((tmp_path / "virt_display.state").read_text())
+        assert state["hyprland_restore"] == restore_specs
 
     def test_nvidia_hyprland_safe_path_refuses_without_restore_specs(self, tmp_path):
-        mock_run = MagicMock(return_value=_ok_run())
+        mock_write = MagicMock(return_value=None)
         with patch("src.display.SCRIPT_DIR", tmp_path), \
              patch("src.display._use_hyprland_safe_path", return_value=True), \
              patch("src.display.hyprland.monitor_specs", return_value={}), \
@@ -328,20 +420,20 @@ class TestConnect:
              patch("src.display.get_card_name_from_device", return_value="card1"), \
              patch("src.display.get_connected_displays", return_value=["DP-1"]), \
              patch("src.display.find_empty_slot", return_value=("DP-3", tmp_path)), \
-             patch("src.display.run_command", mock_run), \
+             patch("src.display.write_sysfs", mock_write), \
              patch("src.display.clear_kwin_output_config"), \
              patch("src.display.create_edid", return_value=b"\x00" * 256):
             result = connect(1280, 800, 60)
 
         assert result is False
-        cmds = [call_args[0][0] for call_args in mock_run.call_args_list]
-        assert not any("echo off > /sys/class/drm/card1-DP-1/status" in c for c in cmds)
+        paths = [str(call_args[0][0]) for call_args in mock_write.call_args_list]
+        assert "/sys/class/drm/card1-DP-1/status" not in paths
 
 
 class TestDisconnect:
     def _write_state(self, path: Path, card: str, port: str, displays: list[str]) -> None:
         (path / "virt_display.state").write_text(
-            f"{card}\n{port}\n{','.join(displays)}"
+            json.dumps({"card": card, "port": port, "previous": displays})
         )
 
     def test_returns_false_when_no_state_file(self, tmp_path, capsys):
@@ -357,10 +449,17 @@ class TestDisconnect:
         assert result is False
         assert "Invalid state" in capsys.readouterr().out
 
+    def test_returns_false_when_state_missing_port(self, tmp_path, capsys):
+        (tmp_path / "virt_display.state").write_text(json.dumps({"card": "card1"}))
+        with patch("src.display.SCRIPT_DIR", tmp_path):
+            result = disconnect()
+        assert result is False
+        assert "Invalid state" in capsys.readouterr().out
+
     def test_returns_true_on_success(self, tmp_path):
         self._write_state(tmp_path, "card1", "DP-2", ["HDMI-1"])
         with patch("src.display.SCRIPT_DIR", tmp_path), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
              patch("src.display.release_crtc", return_value=True):
@@ -370,7 +469,7 @@ class TestDisconnect:
     def test_state_file_deleted_after_disconnect(self, tmp_path):
         self._write_state(tmp_path, "card1", "DP-2", ["HDMI-1"])
         with patch("src.display.SCRIPT_DIR", tmp_path), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
              patch("src.display.release_crtc", return_value=True):
@@ -379,23 +478,21 @@ class TestDisconnect:
 
     def test_turns_on_previous_displays(self, tmp_path):
         self._write_state(tmp_path, "card1", "DP-2", ["HDMI-1", "DP-1"])
-        mock_run = MagicMock(return_value=_ok_run())
+        mock_write = MagicMock(return_value=None)
         with patch("src.display.SCRIPT_DIR", tmp_path), \
-             patch("src.display.run_command", mock_run), \
+             patch("src.display.write_sysfs", mock_write), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.release_crtc", return_value=True):
             disconnect()
-        # Should have called run_command with 'echo on' for previous displays
-        cmds = [call_args[0][0] for call_args in mock_run.call_args_list]
-        on_cmds = [c for c in cmds if "echo on" in c]
-        assert len(on_cmds) >= 2
+        # Should have written 'on' to each previous display's status
+        mock_write.assert_any_call("/sys/class/drm/card1-HDMI-1/status", b"on\n")
+        mock_write.assert_any_call("/sys/class/drm/card1-DP-1/status", b"on\n")
 
     def test_skips_empty_display_names(self, tmp_path):
         self._write_state(tmp_path, "card1", "DP-2", [""])
-        mock_run = MagicMock(return_value=_ok_run())
         mock_force = MagicMock(return_value=True)
         with patch("src.display.SCRIPT_DIR", tmp_path), \
-             patch("src.display.run_command", mock_run), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.force_crtc_assignment", mock_force), \
              patch("src.display.release_crtc", return_value=True):
             result = disconnect()
@@ -405,7 +502,7 @@ class TestDisconnect:
     def test_no_previous_displays(self, tmp_path):
         self._write_state(tmp_path, "card1", "DP-2", [])
         with patch("src.display.SCRIPT_DIR", tmp_path), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.release_crtc", return_value=True):
             result = disconnect()
@@ -413,29 +510,76 @@ class TestDisconnect:
 
     def test_warns_when_turn_off_virtual_fails(self, tmp_path, capsys):
         self._write_state(tmp_path, "card1", "DP-2", [])
-        run_calls = [0]
-
-        def run_side(cmd):
-            run_calls[0] += 1
-            # Last call (echo off for virtual display) fails
-            if "echo off" in cmd:
-                return _fail_run()
-            return _ok_run()
+        def write_side(path, data):
+            # Turning off the virtual display fails
+            if data == b"off\n":
+                return "Permission denied"
+            return None
 
         with patch("src.display.SCRIPT_DIR", tmp_path), \
-             patch("src.display.run_command", side_effect=run_side), \
+             patch("src.display.write_sysfs", side_effect=write_side), \
              patch("src.display.force_crtc_assignment", return_value=True), \
              patch("src.display.release_crtc", return_value=True):
             result = disconnect()
 
         assert result is True
-        assert "Warning" in capsys.readouterr().out
+        assert "Warning: Could not turn off virtual display: Permission denied" in capsys.readouterr().out
+
+    def test_reads_legacy_line_based_state(self, tmp_path):
+        edid_path = str(tmp_path / "DP-2" / "edid_override")
+        _ = (tmp_path / "virt_display.state").write_text(f"card1\nDP-2\nHDMI-1,DP-1\n{edid_path}\n{{}}")
+        mock_write = MagicMock(return_value=None)
+        mock_force = MagicMock(return_value=True)
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.write_sysfs", mock_write), \
+             patch("src.display.force_crtc_assignment", mock_force), \
+             patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
+             patch("src.display.release_crtc", return_value=True):
+            result = disconnect()
+        assert result is True
+        mock_write.assert_any_call("/sys/class/drm/card1-HDMI-1/status", b"on\n")
+        mock_write.assert_any_call("/sys/class/drm/card1-DP-1/status", b"on\n")
+        mock_write.assert_any_call("/sys/class/drm/card1-DP-2/status", b"off\n")
+        mock_write.assert_any_call(edid_path, b"")
+        assert mock_force.call_count == 2
+        assert not (tmp_path / "virt_display.state").exists()
+
+    def test_reads_legacy_state_with_hyprland_restore(self, tmp_path):
+        restore_json = '{"DP-1":{"output":"DP-1","mode":"3440x1440@144.0","position":"0x0","scale":1.0}}'
+        _ = (tmp_path / "virt_display.state").write_text(
+            f"card1\nDP-3\nDP-1\n{tmp_path / 'DP-3' / 'edid_override'}\n{restore_json}"
+        )
+        mock_restore = MagicMock(return_value=True)
+        mock_force = MagicMock(return_value=True)
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.hyprland.restore_outputs", mock_restore), \
+             patch("src.display.write_sysfs", return_value=None), \
+             patch("src.display.force_crtc_assignment", mock_force), \
+             patch("src.display.release_crtc", return_value=True):
+            result = disconnect()
+        assert result is True
+        mock_restore.assert_called_once_with(json.loads(restore_json))
+        mock_force.assert_not_called()
+
+    def test_clears_edid_override(self, tmp_path):
+        edid_path = str(tmp_path / "DP-2" / "edid_override")
+        _ = (tmp_path / "virt_display.state").write_text(
+            json.dumps({"card": "card1", "port": "DP-2", "previous": [], "edid_override": edid_path})
+        )
+        mock_write = MagicMock(return_value=None)
+        with patch("src.display.SCRIPT_DIR", tmp_path), \
+             patch("src.display.write_sysfs", mock_write), \
+             patch("src.display.release_crtc", return_value=True):
+            result = disconnect()
+        assert result is True
+        mock_write.assert_any_call("/sys/class/drm/card1-DP-2/status", b"off\n")
+        mock_write.assert_any_call(edid_path, b"")
 
     def test_forces_crtc_for_all_restored_displays(self, tmp_path):
         self._write_state(tmp_path, "card1", "DP-2", ["HDMI-1", "DP-1"])
         mock_force = MagicMock(return_value=True)
         with patch("src.display.SCRIPT_DIR", tmp_path), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.force_crtc_assignment", mock_force), \
              patch("src.display.wait_for_output_ready", return_value=(True, "1920x1080")), \
              patch("src.display.release_crtc", return_value=True):
@@ -443,15 +587,32 @@ class TestDisconnect:
         assert mock_force.call_count == 2
 
     def test_hyprland_restore_path_skips_crtc_forcing(self, tmp_path):
-        restore_json = '{"DP-1":{"output":"DP-1","mode":"3440x1440@144.0","position":"0x0","scale":1.0,"bitdepth":10,"vrr":1}}'
+        restore_specs = {
+            "DP-1": {
+                "output": "DP-1",
+                "mode": "3440x1440@144.0",
+                "position": "0x0",
+                "scale": 1.0,
+                "bitdepth": 10,
+                "vrr": 1,
+            }
+        }
         (tmp_path / "virt_display.state").write_text(
-            f"card1\nDP-3\nDP-1\n{tmp_path / 'DP-3' / 'edid_override'}\n{restore_json}"
+            json.dumps(
+                {
+                    "card": "card1",
+                    "port": "DP-3",
+                    "previous": ["DP-1"],
+                    "edid_override": str(tmp_path / "DP-3" / "edid_override"),
+                    "hyprland_restore": restore_specs,
+                }
+            )
         )
         mock_restore = MagicMock(return_value=True)
         mock_force = MagicMock(return_value=True)
         with patch("src.display.SCRIPT_DIR", tmp_path), \
              patch("src.display.hyprland.restore_outputs", mock_restore), \
-             patch("src.display.run_command", return_value=_ok_run()), \
+             patch("src.display.write_sysfs", return_value=None), \
              patch("src.display.force_crtc_assignment", mock_force), \
              patch("src.display.release_crtc", return_value=True):
             result = disconnect()
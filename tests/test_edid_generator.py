@@ -104,6 +104,11 @@ class TestCreateEdid:
         e2 = create_edid(width=1280, height=720, refresh_rate=60)
         assert e1 != e2
 
+    def test_repeated_calls_return_cached_edid(self):
+        e1 = create_edid(width=2560, height=1440, refresh_rate=120, enable_hdr=True)
+        e2 = create_edid(width=2560, height=1440, refresh_rate=120, enable_hdr=True)
+        assert e1 is e2
+
     def test_hdr_feature_support_byte(self):
         edid = create_edid(enable_hdr=True)
         assert edid[24] == 0x1A
@@ -122,6 +127,12 @@ class TestCreateEdid:
         # 10 descriptor at bytes 108-125
         assert edid[111] == 0x10
 
+    def test_cea_dtd_duplicates_base_dtd(self):
+        for hdr in (False, True):
+            edid = create_edid(width=2560, height=1440, refresh_rate=144, enable_hdr=hdr)
+            dtd_start = 128 + edid[130]
+            assert edid[dtd_start:dtd_start + 18] == edid[54:72]
+
     def test_cea_support_flags(self):
         edid = create_edid()
         assert edid[131] == 0x70
@@ -131,6 +142,21 @@ class TestCreateEdid:
         assert edid[21] > 0
         assert edid[22] > 0
 
+    def test_screen_size_96_dpi(self):
+        # 1920 px / 96 DPI * 2.54 = 50.8 cm wide, height follows 16:9
+        edid = create_edid(width=1920, height=1080)
+        assert edid[21] == 50
+        assert edid[22] == 28
+
+    def test_screen_size_height_uses_integer_ratio(self):
+        # 1344 px -> 35 cm wide; 35 * 576 / 1344 is exactly 15 cm, which the
+        # old float round-trip truncated to 14
+        edid = create_edid(width=1344, height=576)
+        assert edid[21] == 35
+        assert edid[22] == 15
+        # DTD image height in mm (low byte) follows the header size
+        assert edid[67] == 150
+
     def test_gamma(self):
         edid = create_edid()
         assert edid[23] == 220
@@ -3,6 +3,7 @@
 import pytest
 
 from src.edid.timing import (
+    calculate_blanking,
     calculate_checksum,
     check_if_calculation_breaks,
     get_pixel_clock_info,
@@ -38,6 +39,11 @@ class TestCalculateChecksum:
         cs = calculate_checksum(data)
         assert (sum(data) + cs) % 256 == 0
 
+    def test_memoryview_input(self):
+        data = bytearray(range(128))
+        cs = calculate_checksum(memoryview(data)[0:127])
+        assert (sum(data[0:127]) + cs) % 256 == 0
+
     def test_all_zeros_128_bytes(self):
         assert calculate_checksum(bytes(128)) == 0
 
@@ -47,6 +53,21 @@ class TestCalculateChecksum:
         assert calculate_checksum(data) == 0
 
 
+class TestCalculateBlanking:
+    def test_1080p60(self):
+        h_blank, h_total, v_blank, pixel_clock_hz = calculate_blanking(1920, 1080, 60)
+        assert h_blank == 153
+        assert h_total == 2073
+        assert v_blank == 27
+        assert pixel_clock_hz == 2073 * (1080 + 27) * 60
+
+    def test_minimum_blanking(self):
+        h_blank, h_total, v_blank, _ = calculate_blanking(100, 100, 60)
+        assert h_blank == 80
+        assert h_total == 180
+        assert v_blank == 23
+
+
 class TestCheckIfCalculationBreaks:
     def test_low_res_does_not_break(self):
         assert check_if_calculation_breaks(640, 480, 60) is False
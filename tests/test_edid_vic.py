@@ -2,7 +2,14 @@
 
 from unittest.mock import patch
 
-from src.edid.vic import VIC_RESOLUTIONS, find_best_vic_resolution
+from src.edid.timing import check_if_calculation_breaks, get_pixel_clock_info
+from src.edid.vic import (
+    _VIC_CODES,
+    _VIC_VALID,
+    VIC_RESOLUTIONS,
+    VIC_ROWS,
+    find_best_vic_resolution,
+)
 
 
 class TestVicResolutions:
@@ -22,6 +29,16 @@ class TestVicResolutions:
         for vic, entry in VIC_RESOLUTIONS.items():
             assert len(entry) == 4, f"VIC {vic} has wrong number of fields"
 
+    def test_table_has_all_rows(self):
+        assert len(VIC_ROWS) == 154
+        assert len({row[0] for row in VIC_ROWS}) == 154
+
+    def test_pinned_rows(self):
+        rows = {row[0]: row for row in VIC_ROWS}
+        assert rows[16] == (16, 1920, 1080, 60, "1080p")
+        assert rows[97] == (97, 3840, 2160, 60, "2160p60")
+        assert rows[219] == (219, 4096, 2160, 120, "2160p120_256:135")
+
     def test_all_widths_positive(self):
         for vic, (w, h, r, name) in VIC_RESOLUTIONS.items():
             assert w > 0 and h > 0 and r > 0, f"VIC {vic} has non-positive dims"
@@ -31,35 +48,42 @@ class TestFindBestVicResolution:
     def test_exact_1080p60_match(self):
         result = find_best_vic_resolution(1920, 1080, 60)
         assert result is not None
-        w, h, r, vic, name = result
+        w, h, r, vic, name, clock_mhz = result
         assert w == 1920 and h == 1080 and r == 60
 
     def test_exact_720p60_match(self):
         result = find_best_vic_resolution(1280, 720, 60)
         assert result is not None
-        w, h, r, vic, name = result
+        w, h, r, vic, name, clock_mhz = result
         assert w == 1280 and h == 720 and r == 60
 
-    def test_returns_five_tuple(self):
+    def test_returns_six_tuple(self):
         result = find_best_vic_resolution(1920, 1080, 60)
         assert result is not None
-        assert len(result) == 5
+        assert len(result) == 6
 
     def test_result_types(self):
         result = find_best_vic_resolution(1920, 1080, 60)
         assert result is not None
-        w, h, r, vic, name = result
+        w, h, r, vic, name, clock_mhz = result
         assert isinstance(w, int)
         assert isinstance(h, int)
         assert isinstance(r, int)
         assert isinstance(vic, int)
         assert isinstance(name, str)
+        assert isinstance(clock_mhz, float)
+
+    def test_pixel_clock_matches_timing_helper(self):
+        result = find_best_vic_resolution(1920, 1080, 60)
+        assert result is not None
+        w, h, r, _, _, clock_mhz = result
+        assert clock_mhz == get_pixel_clock_info(w, h, r)[0]
 
     def test_refresh_rate_prioritized(self):
         # Ask for 60Hz — result should have 60Hz refresh rate
         result = find_best_vic_resolution(1920, 1080, 60)
         assert result is not None
-        _, _, r, _, _ = result
+        _, _, r, _, _, _ = result
         assert r == 60
 
     def test_fallback_for_nonstandard_resolution(self):
@@ -68,22 +92,34 @@ class TestFindBestVicResolution:
         assert result is not None
 
     def test_all_vic_calculations_break_returns_none(self):
-        # Patch at the source — vic.py imports it locally inside the function
-        with patch("src.edid.timing.check_if_calculation_breaks", return_value=True):
+        # Validity is precomputed per VIC row at import time
+        with patch("src.edid.vic._VIC_VALID", (False,) * len(VIC_RESOLUTIONS)):
             result = find_best_vic_resolution(1920, 1080, 60)
         assert result is None
 
+    def test_validity_mask_matches_pixel_clock_check(self):
+        for vic, valid in zip(_VIC_CODES, _VIC_VALID):
+            w, h, r, _ = VIC_RESOLUTIONS[vic]
+            assert valid is not check_if_calculation_breaks(w, h, r)
+
+    def test_refresh_without_exact_vic_falls_back_to_full_scan(self):
+        # No VIC runs at 75Hz — the closest refresh rate should still be found
+        result = find_best_vic_resolution(1920, 1080, 75)
+        assert result is not None
+        _, _, r, _, _, _ = result
+        assert r in (60, 100)
+
     def test_vic_code_is_in_dict(self):
         result = find_best_vic_resolution(1920, 1080, 60)
         assert result is not None
-        _, _, _, vic, _ = result
+        _, _, _, vic, _, _ = result
         assert vic in VIC_RESOLUTIONS
 
     def test_aspect_ratio_preference(self):
         # 16:9 target — should prefer 16:9 VIC over 4:3
         result = find_best_vic_resolution(1920, 1080, 60)
         assert result is not None
-        w, h, _, _, _ = result
+        w, h, _, _, _, _ = result
         assert abs(w / h - 16 / 9) < 0.1
 
     def test_prints_best_match(self, capsys):